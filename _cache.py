@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Dataset cache for Top 100 Indian Movies Analysis
+Parses the JSON dataset once and keeps a columnar Parquet copy for later runs
+"""
+
+import os
+import json
+import pandas as pd
+
+JSON_PATH = 'data/top_100_indian_movies.json'
+PARQUET_PATH = 'data/top_100_indian_movies.parquet'
+COLUMNS = ['rank', 'title', 'year', 'rating', 'votes', 'duration']
+
+def build_cache():
+    """Build the movie DataFrame from JSON and write the Parquet cache"""
+    with open(JSON_PATH, 'r', encoding='utf-8') as f:
+        movies = json.load(f)
+
+    df = pd.DataFrame(movies, columns=COLUMNS)
+    df.to_parquet(PARQUET_PATH, engine='pyarrow', index=False)
+    return df
+
+def is_fresh(path):
+    """Check that a derived file exists and is newer than the JSON dataset"""
+    if not os.path.exists(path):
+        return False
+    # Without the source dataset an existing derived file is all there is
+    if not os.path.exists(JSON_PATH):
+        return True
+    return os.path.getmtime(path) >= os.path.getmtime(JSON_PATH)
+
+def cache_is_fresh():
+    """Check that the Parquet cache exists and is newer than the JSON dataset"""
+    return is_fresh(PARQUET_PATH)
+
+def load_movie_frame():
+    """Load the movie DataFrame, rebuilding the Parquet cache when it is stale"""
+    if cache_is_fresh():
+        return pd.read_parquet(PARQUET_PATH, columns=COLUMNS, engine='pyarrow')
+    return build_cache()
@@ -5,49 +5,70 @@ Data analysis script for Indian cinema ratings and statistics
 """
 
 import json
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from collections import Counter
 import numpy as np
+from _cache import load_movie_frame
+
+# Bucket lower edges (ascending) and labels for the distribution tables
+RATING_EDGES = [7.8, 8.0, 8.5, 9.0]
+RATING_LABELS = ['7.8-7.9', '8.0-8.4', '8.5-8.9', '9.0+']
+VOTE_EDGES = [10000, 50000, 100000, 500000]
+VOTE_LABELS = ['10K-49K', '50K-99K', '100K-499K', '500K+']
+
+# Columns unpacked by the console listings
+LISTING_COLUMNS = ['rank', 'title', 'year', 'rating', 'votes']
+
+# Vote bins for the timeline bubble sizes
+BUBBLE_EDGES = [10000, 25000, 50000, 100000, 500000]
+BUBBLE_LABELS = ['10K-24K', '25K-49K', '50K-99K', '100K-499K', '500K+']
+
+def bucket_counts(values, edges, labels):
+    """Count values into [edge, next edge) buckets with a single sorted sweep"""
+    ordered = np.sort(np.asarray(values))
+    idx = np.searchsorted(ordered, edges, side='left')
+    counts = np.diff(np.r_[idx, len(ordered)])
+    # Highest bucket first, matching the report layout
+    return {label: int(count) for label, count in zip(labels[::-1], counts[::-1])}
+
+def decade_counts(years):
+    """Count movies per decade, keyed by the decade's first year in ascending order"""
+    decades, counts = np.unique((np.asarray(years) // 10) * 10, return_counts=True)
+    return dict(zip(decades.tolist(), counts.tolist()))
+
+def sort_movies(df):
+    """Sort the movies once by rating and once by votes, highest first"""
+    df_r = df.sort_values('rating', ascending=False, kind='stable').reset_index(drop=True)
+    df_v = df.sort_values('votes', ascending=False, kind='stable').reset_index(drop=True)
+    return df_r, df_v
 
 def load_movie_data():
-    """Load the movie data from JSON file"""
-    with open('data/top_100_indian_movies.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Load the movie data as a DataFrame, via the Parquet cache"""
+    return load_movie_frame()
 
-def analyze_movies(movies):
+def analyze_movies(df):
     """Perform comprehensive analysis of the movie data"""
-    df = pd.DataFrame(movies)
+    years = df['year'].to_numpy()
+    ratings = df['rating'].to_numpy()
+    votes = df['votes'].to_numpy()
+    df_r, df_v = sort_movies(df)
     
     print("=== TOP 100 INDIAN MOVIES ANALYSIS ===")
     print(f"Total movies analyzed: {len(df)}")
-    print(f"Year range: {df['year'].min()} - {df['year'].max()}")
-    print(f"Rating range: {df['rating'].min()} - {df['rating'].max()}")
-    print(f"Vote range: {df['votes'].min():,} - {df['votes'].max():,}")
+    print(f"Year range: {years.min()} - {years.max()}")
+    print(f"Rating range: {ratings.min()} - {ratings.max()}")
+    print(f"Vote range: {votes.min():,} - {votes.max():,}")
     print()
     
     # Year distribution analysis
     print("=== YEAR DISTRIBUTION ===")
-    year_counts = df['year'].value_counts().sort_index()
     print("Movies by decade:")
-    decades = {}
-    for year in df['year']:
-        decade = (year // 10) * 10
-        decades[decade] = decades.get(decade, 0) + 1
-    
-    for decade in sorted(decades.keys()):
-        print(f"{decade}s: {decades[decade]} movies")
+    for decade, count in decade_counts(years).items():
+        print(f"{decade}s: {count} movies")
     print()
     
     # Rating distribution analysis
     print("=== RATING DISTRIBUTION ===")
-    rating_ranges = {
-        '9.0+': len(df[df['rating'] >= 9.0]),
-        '8.5-8.9': len(df[(df['rating'] >= 8.5) & (df['rating'] < 9.0)]),
-        '8.0-8.4': len(df[(df['rating'] >= 8.0) & (df['rating'] < 8.5)]),
-        '7.8-7.9': len(df[(df['rating'] >= 7.8) & (df['rating'] < 8.0)])
-    }
+    rating_ranges = bucket_counts(ratings, RATING_EDGES, RATING_LABELS)
     
     for range_name, count in rating_ranges.items():
         print(f"{range_name}: {count} movies")
@@ -55,12 +76,7 @@ def analyze_movies(movies):
     
     # Vote distribution analysis
     print("=== VOTE DISTRIBUTION ===")
-    vote_ranges = {
-        '500K+': len(df[df['votes'] >= 500000]),
-        '100K-499K': len(df[(df['votes'] >= 100000) & (df['votes'] < 500000)]),
-        '50K-99K': len(df[(df['votes'] >= 50000) & (df['votes'] < 100000)]),
-        '10K-49K': len(df[(df['votes'] >= 10000) & (df['votes'] < 50000)])
-    }
+    vote_ranges = bucket_counts(votes, VOTE_EDGES, VOTE_LABELS)
     
     for range_name, count in vote_ranges.items():
         print(f"{range_name}: {count} movies")
@@ -68,41 +84,51 @@ def analyze_movies(movies):
     
     # Top movies by different criteria
     print("=== TOP 10 BY RATING ===")
-    top_by_rating = df.nlargest(10, 'rating')
-    for _, movie in top_by_rating.iterrows():
-        print(f"{movie['rank']}. {movie['title']} ({movie['year']}) - {movie['rating']}/10")
+    top_by_rating = df_r.head(10)
+    for rank, title, year, rating, _ in top_by_rating[LISTING_COLUMNS].itertuples(index=False, name=None):
+        print(f"{rank}. {title} ({year}) - {rating}/10")
     print()
     
     print("=== TOP 10 BY VOTES ===")
-    top_by_votes = df.nlargest(10, 'votes')
-    for _, movie in top_by_votes.iterrows():
-        print(f"{movie['rank']}. {movie['title']} ({movie['year']}) - {movie['votes']:,} votes")
+    top_by_votes = df_v.head(10)
+    for rank, title, year, _, movie_votes in top_by_votes[LISTING_COLUMNS].itertuples(index=False, name=None):
+        print(f"{rank}. {title} ({year}) - {movie_votes:,} votes")
     print()
     
     print("=== MOST RECENT MOVIES (2020+) ===")
-    recent_movies = df[df['year'] >= 2020].sort_values('rating', ascending=False)
-    for _, movie in recent_movies.head(10).iterrows():
-        print(f"{movie['rank']}. {movie['title']} ({movie['year']}) - {movie['rating']}/10")
+    recent_movies = df_r[df_r['year'] >= 2020]
+    for rank, title, year, rating, _ in recent_movies.head(10)[LISTING_COLUMNS].itertuples(index=False, name=None):
+        print(f"{rank}. {title} ({year}) - {rating}/10")
     print()
     
-    return df
+    return df, df_r, df_v
 
-def create_visualizations(df):
-    """Create visualizations for the movie data"""
+def create_visualizations(df, df_r=None):
+    """Create visualizations for the movie data, reusing a pre-sorted frame when given"""
+    if df_r is None:
+        df_r, _ = sort_movies(df)
+    
+    # matplotlib is only imported when charts are requested
+    import matplotlib.pyplot as plt
+    
+    # One grouped pass over year feeds every per-year and per-decade chart
+    years = df['year'].to_numpy()
+    ratings = df['rating'].to_numpy()
+    votes = df['votes'].to_numpy()
+    yearly_stats = df.groupby('year', sort=True).agg(movie_count=('rating', 'size'))
+    year_counts = yearly_stats['movie_count']
+    decade_totals = year_counts.groupby((year_counts.index // 10) * 10).sum()
+    
     plt.style.use('default')
-    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    # Axes are placed explicitly below, so skip matplotlib's automatic layout pass
+    with plt.rc_context({'figure.autolayout': False}):
+        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
     fig.suptitle('Top 100 Indian Movies Analysis (2000+)', fontsize=16, fontweight='bold')
     
     # 1. Movies by decade
-    decades = {}
-    for year in df['year']:
-        decade = (year // 10) * 10
-        decades[decade] = decades.get(decade, 0) + 1
-    
-    decade_labels = [f"{d}s" for d in sorted(decades.keys())]
-    decade_counts = [decades[d] for d in sorted(decades.keys())]
+    decade_labels = [f"{d}s" for d in decade_totals.index]
     
-    axes[0, 0].bar(decade_labels, decade_counts, color='skyblue', edgecolor='navy')
+    axes[0, 0].bar(decade_labels, decade_totals.to_numpy(), color='skyblue', edgecolor='navy')
     axes[0, 0].set_title('Movies by Decade')
     axes[0, 0].set_ylabel('Number of Movies')
     axes[0, 0].grid(axis='y', alpha=0.3)
@@ -114,102 +140,122 @@ def create_visualizations(df):
     axes[0, 1].set_ylabel('Number of Movies')
     axes[0, 1].grid(axis='y', alpha=0.3)
     
-    # 3. Votes vs Rating scatter plot
-    scatter = axes[1, 0].scatter(df['votes'], df['rating'], alpha=0.6, c=df['year'], cmap='viridis')
-    axes[1, 0].set_title('Votes vs Rating (colored by year)')
+    # 3. Votes vs Rating, one fixed-color marker line per decade
+    year_decades = (years // 10) * 10
+    colors = plt.cm.viridis(np.linspace(0, 1, len(decade_totals)))
+    for decade, color in zip(decade_totals.index, colors):
+        mask = year_decades == decade
+        axes[1, 0].plot(votes[mask], ratings[mask], 'o', color=color, alpha=0.6, label=f"{decade}s")
+    axes[1, 0].set_title('Votes vs Rating (colored by decade)')
     axes[1, 0].set_xlabel('Number of Votes')
     axes[1, 0].set_ylabel('IMDb Rating')
     axes[1, 0].set_xscale('log')
     axes[1, 0].grid(alpha=0.3)
-    plt.colorbar(scatter, ax=axes[1, 0], label='Year')
+    axes[1, 0].legend(title='Decade')
     
     # 4. Top 15 movies by rating
-    top_15 = df.nlargest(15, 'rating')
+    top_15 = df_r.head(15)
     y_pos = np.arange(len(top_15))
     axes[1, 1].barh(y_pos, top_15['rating'], color='coral')
     axes[1, 1].set_yticks(y_pos)
-    axes[1, 1].set_yticklabels([f"{movie['title'][:20]}..." if len(movie['title']) > 20 else movie['title'] 
-                               for _, movie in top_15.iterrows()], fontsize=8)
+    titles = top_15['title']
+    labels = np.where(titles.str.len() > 20, titles.str[:20] + '...', titles)
+    axes[1, 1].set_yticklabels(labels, fontsize=8)
     axes[1, 1].set_title('Top 15 Movies by Rating')
     axes[1, 1].set_xlabel('IMDb Rating')
     axes[1, 1].grid(axis='x', alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig('visualizations/movie_analysis_charts.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # Create a timeline chart
-    plt.figure(figsize=(15, 8))
-    
-    # Group movies by year and calculate average rating
-    yearly_stats = df.groupby('year').agg({
-        'rating': ['mean', 'count'],
-        'votes': 'mean'
-    }).round(2)
-    
-    yearly_stats.columns = ['avg_rating', 'movie_count', 'avg_votes']
-    yearly_stats = yearly_stats.reset_index()
+    fig.subplots_adjust(left=0.06, right=0.98, bottom=0.06, top=0.93, wspace=0.3, hspace=0.25)
+    fig.savefig('visualizations/movie_analysis_charts.png', dpi=150, bbox_inches='tight')
+    plt.close(fig)
     
     # Create subplot for timeline
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 10))
-    
-    # Timeline of movies
-    ax1.scatter(df['year'], df['rating'], s=df['votes']/1000, alpha=0.6, c=df['rating'], cmap='RdYlGn')
-    ax1.set_title('Timeline of Top 100 Indian Movies (2000+)\nBubble size = Number of votes, Color = Rating')
+    with plt.rc_context({'figure.autolayout': False}):
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 10))
+    
+    # Timeline of movies, one fixed-size marker line per vote bin
+    # Movies below the lowest edge share the smallest bin rather than being dropped
+    size_bins = np.clip(np.searchsorted(BUBBLE_EDGES, votes, side='right') - 1, 0, len(BUBBLE_LABELS) - 1)
+    for size_bin, label in enumerate(BUBBLE_LABELS):
+        mask = size_bins == size_bin
+        if not mask.any():
+            continue
+        # Marker size is a diameter, so take the root of the old bubble area
+        markersize = np.sqrt(votes[mask].mean() / 1000)
+        ax1.plot(years[mask], ratings[mask], 'o', markersize=markersize, alpha=0.6,
+                 color='seagreen', label=label)
+    ax1.set_title('Timeline of Top 100 Indian Movies (2000+)\nBubble size = Number of votes')
     ax1.set_xlabel('Year')
     ax1.set_ylabel('IMDb Rating')
     ax1.grid(alpha=0.3)
     ax1.set_ylim(7.7, 9.1)
-    
-    # Add colorbar
-    sm = plt.cm.ScalarMappable(cmap='RdYlGn', norm=plt.Normalize(vmin=df['rating'].min(), vmax=df['rating'].max()))
-    sm.set_array([])
-    plt.colorbar(sm, ax=ax1, label='IMDb Rating')
+    ax1.legend(title='Votes', loc='upper left', markerscale=0.5)
     
     # Movies per year
-    year_counts = df['year'].value_counts().sort_index()
-    ax2.bar(year_counts.index, year_counts.values, alpha=0.7, color='steelblue')
+    ax2.bar(year_counts.index, year_counts.to_numpy(), alpha=0.7, color='steelblue')
     ax2.set_title('Number of Top Movies by Year')
     ax2.set_xlabel('Year')
     ax2.set_ylabel('Number of Movies')
     ax2.grid(axis='y', alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig('visualizations/movie_timeline.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.subplots_adjust(left=0.06, right=0.98, bottom=0.06, top=0.93, hspace=0.3)
+    fig.savefig('visualizations/movie_timeline.png', dpi=150, bbox_inches='tight')
+    plt.close(fig)
     
     print("Visualizations saved:")
     print("- visualizations/movie_analysis_charts.png")
     print("- visualizations/movie_timeline.png")
 
-def generate_summary_stats(df):
-    """Generate summary statistics"""
+def generate_summary_stats(df, df_r=None, df_v=None):
+    """Generate summary statistics, reusing pre-sorted frames when given"""
+    if df_r is None or df_v is None:
+        df_r, df_v = sort_movies(df)
+    
+    r = df['rating'].to_numpy()
+    v = df['votes'].to_numpy()
+    y = df['year'].to_numpy()
+    t = df['title'].to_numpy()
+    
+    years, year_counts = np.unique(y, return_counts=True)
+    
     stats = {
         'total_movies': int(len(df)),
-        'avg_rating': float(round(df['rating'].mean(), 2)),
-        'median_rating': float(round(df['rating'].median(), 2)),
-        'avg_votes': int(df['votes'].mean()),
-        'median_votes': int(df['votes'].median()),
-        'year_range': f"{int(df['year'].min())}-{int(df['year'].max())}",
-        'most_productive_year': int(df['year'].value_counts().index[0]),
-        'highest_rated_movie': str(df.loc[df['rating'].idxmax()]['title']),
-        'most_voted_movie': str(df.loc[df['votes'].idxmax()]['title']),
-        'newest_movie': str(df.loc[df['year'].idxmax()]['title']),
-        'oldest_movie': str(df.loc[df['year'].idxmin()]['title'])
+        'avg_rating': float(round(r.mean(), 2)),
+        'median_rating': float(round(np.median(r), 2)),
+        'avg_votes': int(v.mean()),
+        'median_votes': int(np.median(v)),
+        'year_range': f"{int(y.min())}-{int(y.max())}",
+        'most_productive_year': int(years[year_counts.argmax()]),
+        'highest_rated_movie': str(t[r.argmax()]),
+        'most_voted_movie': str(t[v.argmax()]),
+        'newest_movie': str(t[y.argmax()]),
+        'oldest_movie': str(t[y.argmin()])
     }
     
+    # Derived tables shared with the report generator
+    recent_movies = df_r[df_r['year'] >= 2020]
+    
+    stats.update({
+        'decades': {str(d): c for d, c in decade_counts(y).items()},
+        'rating_ranges': bucket_counts(r, RATING_EDGES, RATING_LABELS),
+        'vote_ranges': bucket_counts(v, VOTE_EDGES, VOTE_LABELS),
+        'top_by_rating': df_r.head(10).to_dict('records'),
+        'top_by_votes': df_v.head(10).to_dict('records'),
+        'recent': recent_movies.head(10).to_dict('records')
+    })
+    
     return stats
 
 if __name__ == "__main__":
     # Load and analyze data
-    movies = load_movie_data()
-    df = analyze_movies(movies)
+    df = load_movie_data()
+    df, df_r, df_v = analyze_movies(df)
     
     # Create visualizations
-    create_visualizations(df)
+    create_visualizations(df, df_r)
     
     # Generate summary statistics
-    stats = generate_summary_stats(df)
+    stats = generate_summary_stats(df, df_r, df_v)
     
     # Save summary statistics
     with open('data/movie_summary_stats.json', 'w', encoding='utf-8') as f:
@@ -217,6 +263,8 @@ if __name__ == "__main__":
     
     print("\nSUMMARY STATISTICS:")
     for key, value in stats.items():
+        if isinstance(value, (dict, list)):
+            continue
         print(f"{key.replace('_', ' ').title()}: {value}")
     
     print("\nAnalysis complete! Files generated:")
@@ -5,82 +5,97 @@ Creates comprehensive Excel and Markdown reports
 """
 
 import json
+from copy import copy
 import pandas as pd
 from datetime import datetime
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
+from _cache import load_movie_frame, is_fresh
+from analyze_movies import generate_summary_stats
 
-def load_data():
-    """Load all the generated data files"""
-    with open('data/top_100_indian_movies.json', 'r', encoding='utf-8') as f:
-        movies = json.load(f)
+STATS_PATH = 'data/movie_summary_stats.json'
+
+# Precomputed tables the reports read from the summary stats
+REPORT_TABLE_KEYS = ['decades', 'rating_ranges', 'top_by_rating', 'top_by_votes', 'recent']
+
+# Markdown line templates, filled from movie records with str.format
+MOVIE_ROW_FMT = "| {rank} | {title} | {year} | {rating}/10 | {votes:,} | {duration} |"
+TOP_BY_RATING_FMT = "{0}. **{title}** ({year}) - {rating}/10 ({votes:,} votes)"
+TOP_BY_VOTES_FMT = "{0}. **{title}** ({year}) - {votes:,} votes ({rating}/10)"
+RECENT_FMT = "- **{title}** ({year}) - {rating}/10"
+
+def load_data(df=None):
+    """Load all the generated data files, reusing a cached DataFrame when given"""
+    if df is None:
+        df = load_movie_frame()
     
-    try:
-        with open('data/movie_summary_stats.json', 'r', encoding='utf-8') as f:
+    stats = None
+    if is_fresh(STATS_PATH):
+        with open(STATS_PATH, 'r', encoding='utf-8') as f:
             stats = json.load(f)
-    except FileNotFoundError:
-        # Generate basic stats if file doesn't exist
-        df = pd.DataFrame(movies)
-        stats = {
-            'total_movies': len(df),
-            'avg_rating': round(df['rating'].mean(), 2),
-            'median_rating': round(df['rating'].median(), 2),
-            'avg_votes': int(df['votes'].mean()),
-            'median_votes': int(df['votes'].median()),
-            'year_range': f"{df['year'].min()}-{df['year'].max()}",
-            'most_productive_year': df['year'].value_counts().index[0],
-            'highest_rated_movie': df.loc[df['rating'].idxmax()]['title'],
-            'most_voted_movie': df.loc[df['votes'].idxmax()]['title']
-        }
-    
-    return movies, stats
-
-def create_excel_report(movies, stats):
+    
+    # Regenerate the stats in-process if the file is missing, older than the
+    # dataset, or written before the report tables were added to it
+    if stats is None or any(key not in stats for key in REPORT_TABLE_KEYS):
+        stats = generate_summary_stats(df)
+    
+    return df, stats
+
+def styled_cell(ws, value, **styles):
+    """Create a write-only cell with the given style attributes applied"""
+    from openpyxl.cell import WriteOnlyCell
+    
+    cell = WriteOnlyCell(ws, value=value)
+    for name, style in styles.items():
+        setattr(cell, name, style)
+    return cell
+
+def create_excel_report(df, stats):
     """Create comprehensive Excel report"""
-    # Create workbook and worksheets
-    wb = openpyxl.Workbook()
+    # openpyxl is only imported when an Excel report is requested
+    import openpyxl
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+    from openpyxl.styles.fonts import DEFAULT_FONT
+    from openpyxl.utils import get_column_letter
+    from openpyxl.utils.dataframe import dataframe_to_rows
     
-    # Remove default sheet
-    wb.remove(wb.active)
+    # Create a streaming workbook; rows are flushed as they are appended
+    wb = openpyxl.Workbook(write_only=True)
     
     # Create sheets
-    summary_sheet = wb.create_sheet("Summary")
+    summary_sheet = wb.create_sheet("Executive Summary")
     movies_sheet = wb.create_sheet("Top 100 Movies")
-    analysis_sheet = wb.create_sheet("Analysis")
+    analysis_sheet = wb.create_sheet("Detailed Analysis")
     
     # Define styles
     header_font = Font(bold=True, size=14, color="FFFFFF")
     header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
     subheader_font = Font(bold=True, size=12)
     subheader_fill = PatternFill(start_color="D9E2F3", end_color="D9E2F3", fill_type="solid")
+    bold_font = Font(bold=True)
     border = Border(left=Side(style='thin'), right=Side(style='thin'), 
                    top=Side(style='thin'), bottom=Side(style='thin'))
     
     # === SUMMARY SHEET ===
-    summary_sheet.title = "Executive Summary"
-    
     # Title
-    summary_sheet['A1'] = "Top 100 Indian Movies Analysis Report"
-    summary_sheet['A1'].font = Font(bold=True, size=18)
-    summary_sheet.merge_cells('A1:D1')
+    summary_sheet.append([styled_cell(summary_sheet, "Top 100 Indian Movies Analysis Report",
+                                      font=Font(bold=True, size=18))])
+    summary_sheet.merged_cells.add('A1:D1')
     
     # Date
-    summary_sheet['A2'] = f"Generated on: {datetime.now().strftime('%B %d, %Y')}"
-    summary_sheet['A2'].font = Font(size=12, italic=True)
-    summary_sheet.merge_cells('A2:D2')
+    summary_sheet.append([styled_cell(summary_sheet, f"Generated on: {datetime.now().strftime('%B %d, %Y')}",
+                                      font=Font(size=12, italic=True))])
+    summary_sheet.merged_cells.add('A2:D2')
+    summary_sheet.append([])
     
     # Criteria
-    summary_sheet['A4'] = "Selection Criteria:"
-    summary_sheet['A4'].font = subheader_font
-    summary_sheet['A5'] = "• Indian movies only"
-    summary_sheet['A6'] = "• IMDb rating ≥ 7.8"
-    summary_sheet['A7'] = "• Number of votes ≥ 10,000"
-    summary_sheet['A8'] = "• Released after year 2000"
+    summary_sheet.append([styled_cell(summary_sheet, "Selection Criteria:", font=subheader_font)])
+    summary_sheet.append(["• Indian movies only"])
+    summary_sheet.append(["• IMDb rating ≥ 7.8"])
+    summary_sheet.append(["• Number of votes ≥ 10,000"])
+    summary_sheet.append(["• Released after year 2000"])
+    summary_sheet.append([])
     
     # Key Statistics
-    summary_sheet['A10'] = "Key Statistics:"
-    summary_sheet['A10'].font = subheader_font
+    summary_sheet.append([styled_cell(summary_sheet, "Key Statistics:", font=subheader_font)])
     
     stats_data = [
         ["Total Movies Analyzed", stats['total_movies']],
@@ -93,122 +108,89 @@ def create_excel_report(movies, stats):
         ["Most Voted Movie", stats['most_voted_movie']]
     ]
     
-    for i, (label, value) in enumerate(stats_data, start=11):
-        summary_sheet[f'A{i}'] = label
-        summary_sheet[f'B{i}'] = value
-        summary_sheet[f'A{i}'].font = Font(bold=True)
+    for label, value in stats_data:
+        summary_sheet.append([styled_cell(summary_sheet, label, font=bold_font), value])
     
     # === MOVIES SHEET ===
-    movies_sheet.title = "Top 100 Movies"
+    headers = ['Rank', 'Title', 'Year', 'Rating', 'Votes', 'Duration']
+    columns = ['rank', 'title', 'year', 'rating', 'votes', 'duration']
+    rows = list(df[columns].itertuples(index=False, name=None))
+    
+    # Column widths must be set before the first row is streamed
+    widths = {column: max(len(header), int(df[column].astype(str).str.len().max()))
+              for column, header in zip(columns, headers)}
+    for col, width in enumerate(widths.values(), start=1):
+        movies_sheet.column_dimensions[get_column_letter(col)].width = min(width + 2, 50)
     
     # Add headers
-    headers = ['Rank', 'Title', 'Year', 'Rating', 'Votes', 'Duration']
-    for col, header in enumerate(headers, start=1):
-        cell = movies_sheet.cell(row=1, column=col, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center')
-        cell.border = border
+    movies_sheet.append([styled_cell(movies_sheet, header, font=header_font, fill=header_fill,
+                                     alignment=Alignment(horizontal='center'), border=border)
+                         for header in headers])
+    
+    # Register one shared bordered style per horizontal alignment
+    cell_styles = {}
+    for horizontal in ('center', 'right', None):
+        name = f"movie_cell_{horizontal or 'general'}"
+        wb.add_named_style(NamedStyle(name=name, font=copy(DEFAULT_FONT), border=border,
+                                      alignment=Alignment(horizontal=horizontal)))
+        cell_styles[horizontal] = name
+    
+    # Center align rank, year, rating, duration; right align votes
+    column_styles = [cell_styles[h] for h in ('center', None, 'center', 'center', 'right', 'center')]
     
     # Add data
-    for row_idx, movie in enumerate(movies, start=2):
-        movies_sheet.cell(row=row_idx, column=1, value=movie['rank']).border = border
-        movies_sheet.cell(row=row_idx, column=2, value=movie['title']).border = border
-        movies_sheet.cell(row=row_idx, column=3, value=movie['year']).border = border
-        movies_sheet.cell(row=row_idx, column=4, value=movie['rating']).border = border
-        movies_sheet.cell(row=row_idx, column=5, value=movie['votes']).border = border
-        movies_sheet.cell(row=row_idx, column=6, value=movie['duration']).border = border
-        
-        # Center align rank, year, rating
-        movies_sheet.cell(row=row_idx, column=1).alignment = Alignment(horizontal='center')
-        movies_sheet.cell(row=row_idx, column=3).alignment = Alignment(horizontal='center')
-        movies_sheet.cell(row=row_idx, column=4).alignment = Alignment(horizontal='center')
-        movies_sheet.cell(row=row_idx, column=5).alignment = Alignment(horizontal='right')
-        movies_sheet.cell(row=row_idx, column=6).alignment = Alignment(horizontal='center')
-    
-    # Auto-adjust column widths
-    for column in movies_sheet.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        movies_sheet.column_dimensions[column_letter].width = adjusted_width
+    for row in rows:
+        movies_sheet.append([styled_cell(movies_sheet, value, style=style)
+                             for value, style in zip(row, column_styles)])
     
     # === ANALYSIS SHEET ===
-    analysis_sheet.title = "Detailed Analysis"
-    
-    # Decade distribution
-    analysis_sheet['A1'] = "Distribution by Decade"
-    analysis_sheet['A1'].font = subheader_font
-    analysis_sheet['A1'].fill = subheader_fill
-    
-    decades = {}
-    for movie in movies:
-        decade = (movie['year'] // 10) * 10
-        decades[decade] = decades.get(decade, 0) + 1
-    
-    analysis_sheet['A2'] = "Decade"
-    analysis_sheet['B2'] = "Count"
-    analysis_sheet['A2'].font = Font(bold=True)
-    analysis_sheet['B2'].font = Font(bold=True)
-    
-    for i, (decade, count) in enumerate(sorted(decades.items()), start=3):
-        analysis_sheet[f'A{i}'] = f"{decade}s"
-        analysis_sheet[f'B{i}'] = count
-    
-    # Rating distribution
-    analysis_sheet['D1'] = "Rating Distribution"
-    analysis_sheet['D1'].font = subheader_font
-    analysis_sheet['D1'].fill = subheader_fill
-    
-    rating_ranges = {
-        '9.0+': len([m for m in movies if m['rating'] >= 9.0]),
-        '8.5-8.9': len([m for m in movies if 8.5 <= m['rating'] < 9.0]),
-        '8.0-8.4': len([m for m in movies if 8.0 <= m['rating'] < 8.5]),
-        '7.8-7.9': len([m for m in movies if 7.8 <= m['rating'] < 8.0])
-    }
-    
-    analysis_sheet['D2'] = "Rating Range"
-    analysis_sheet['E2'] = "Count"
-    analysis_sheet['D2'].font = Font(bold=True)
-    analysis_sheet['E2'].font = Font(bold=True)
-    
-    for i, (range_name, count) in enumerate(rating_ranges.items(), start=3):
-        analysis_sheet[f'D{i}'] = range_name
-        analysis_sheet[f'E{i}'] = count
+    # Decade and rating distributions side by side
+    analysis_sheet.append([
+        styled_cell(analysis_sheet, "Distribution by Decade", font=subheader_font, fill=subheader_fill),
+        None, None,
+        styled_cell(analysis_sheet, "Rating Distribution", font=subheader_font, fill=subheader_fill)
+    ])
+    analysis_sheet.append([
+        styled_cell(analysis_sheet, "Decade", font=bold_font),
+        styled_cell(analysis_sheet, "Count", font=bold_font),
+        None,
+        styled_cell(analysis_sheet, "Rating Range", font=bold_font),
+        styled_cell(analysis_sheet, "Count", font=bold_font)
+    ])
+    
+    decade_df = pd.DataFrame({'decade': [f"{d}s" for d in stats['decades']],
+                              'count': list(stats['decades'].values())}, dtype=object)
+    rating_df = pd.DataFrame({'range': list(stats['rating_ranges']),
+                              'count': list(stats['rating_ranges'].values())}, dtype=object)
+    distribution_df = pd.concat([decade_df, rating_df], axis=1)
+    distribution_df = distribution_df.where(distribution_df.notna(), None)
+    distribution_df.insert(2, 'gap', None)
+    for row in dataframe_to_rows(distribution_df, index=False, header=False):
+        analysis_sheet.append(row)
+    
+    # Keep the top-10 table starting on row 8
+    for _ in range(len(distribution_df), 5):
+        analysis_sheet.append([])
     
     # Top 10 by rating
-    analysis_sheet['A8'] = "Top 10 by Rating"
-    analysis_sheet['A8'].font = subheader_font
-    analysis_sheet['A8'].fill = subheader_fill
+    analysis_sheet.append([styled_cell(analysis_sheet, "Top 10 by Rating", font=subheader_font, fill=subheader_fill)])
+    analysis_sheet.append([styled_cell(analysis_sheet, header, font=bold_font)
+                           for header in ['Rank', 'Title', 'Year', 'Rating']])
     
-    top_by_rating = sorted(movies, key=lambda x: x['rating'], reverse=True)[:10]
-    
-    analysis_sheet['A9'] = "Rank"
-    analysis_sheet['B9'] = "Title"
-    analysis_sheet['C9'] = "Year"
-    analysis_sheet['D9'] = "Rating"
-    for col in ['A9', 'B9', 'C9', 'D9']:
-        analysis_sheet[col].font = Font(bold=True)
-    
-    for i, movie in enumerate(top_by_rating, start=10):
-        analysis_sheet[f'A{i}'] = movie['rank']
-        analysis_sheet[f'B{i}'] = movie['title']
-        analysis_sheet[f'C{i}'] = movie['year']
-        analysis_sheet[f'D{i}'] = movie['rating']
+    top_df = pd.DataFrame(stats['top_by_rating'], columns=['rank', 'title', 'year', 'rating'])
+    for row in dataframe_to_rows(top_df, index=False, header=False):
+        analysis_sheet.append(row)
     
     # Save workbook
     wb.save('reports/Top_100_Indian_Movies_Report.xlsx')
     print("Excel report saved: reports/Top_100_Indian_Movies_Report.xlsx")
 
-def create_markdown_report(movies, stats):
+def create_markdown_report(df, stats):
     """Create comprehensive Markdown report"""
-    report_content = f"""# Top 100 Indian Movies Analysis Report
+    vote_counts = df['votes'].to_numpy()
+    parts = []
+    
+    parts.append(f"""# Top 100 Indian Movies Analysis Report
 
 **Generated on:** {datetime.now().strftime('%B %d, %Y')}
 
@@ -247,79 +229,62 @@ The data was collected from IMDb using advanced search filters:
 
 ### Distribution by Decade
 
-"""
+""")
     
     # Add decade distribution
-    decades = {}
-    for movie in movies:
-        decade = (movie['year'] // 10) * 10
-        decades[decade] = decades.get(decade, 0) + 1
+    for decade, count in stats['decades'].items():
+        parts.append(f"- **{decade}s:** {count} movies\n")
     
-    for decade in sorted(decades.keys()):
-        report_content += f"- **{decade}s:** {decades[decade]} movies\n"
-    
-    report_content += f"""
+    parts.append(f"""
 ### Rating Distribution
 
-"""
+""")
     
     # Add rating distribution
-    rating_ranges = {
-        '9.0+': len([m for m in movies if m['rating'] >= 9.0]),
-        '8.5-8.9': len([m for m in movies if 8.5 <= m['rating'] < 9.0]),
-        '8.0-8.4': len([m for m in movies if 8.0 <= m['rating'] < 8.5]),
-        '7.8-7.9': len([m for m in movies if 7.8 <= m['rating'] < 8.0])
-    }
-    
-    for range_name, count in rating_ranges.items():
-        report_content += f"- **{range_name}:** {count} movies\n"
+    for range_name, count in stats['rating_ranges'].items():
+        parts.append(f"- **{range_name}:** {count} movies\n")
     
-    report_content += f"""
+    parts.append(f"""
 ### Top 10 Movies by Rating
 
-"""
+""")
     
     # Add top 10 by rating
-    top_by_rating = sorted(movies, key=lambda x: x['rating'], reverse=True)[:10]
-    for i, movie in enumerate(top_by_rating, 1):
-        report_content += f"{i}. **{movie['title']}** ({movie['year']}) - {movie['rating']}/10 ({movie['votes']:,} votes)\n"
+    parts.append("".join(TOP_BY_RATING_FMT.format(i, **movie) + "\n"
+                         for i, movie in enumerate(stats['top_by_rating'], 1)))
     
-    report_content += f"""
+    parts.append(f"""
 ### Top 10 Movies by Vote Count
 
-"""
+""")
     
     # Add top 10 by votes
-    top_by_votes = sorted(movies, key=lambda x: x['votes'], reverse=True)[:10]
-    for i, movie in enumerate(top_by_votes, 1):
-        report_content += f"{i}. **{movie['title']}** ({movie['year']}) - {movie['votes']:,} votes ({movie['rating']}/10)\n"
+    parts.append("".join(TOP_BY_VOTES_FMT.format(i, **movie) + "\n"
+                         for i, movie in enumerate(stats['top_by_votes'], 1)))
     
-    report_content += f"""
+    parts.append(f"""
 ### Recent Excellence (2020+)
 
 The following movies from 2020 onwards demonstrate the continued excellence of Indian cinema:
 
-"""
+""")
     
     # Add recent movies
-    recent_movies = [m for m in movies if m['year'] >= 2020]
-    recent_movies.sort(key=lambda x: x['rating'], reverse=True)
-    
-    for movie in recent_movies[:10]:
-        report_content += f"- **{movie['title']}** ({movie['year']}) - {movie['rating']}/10\n"
+    parts.append("".join(RECENT_FMT.format_map(movie) + "\n" for movie in stats['recent']))
     
-    report_content += f"""
+    parts.append(f"""
 ## Complete List: Top 100 Indian Movies
 
 | Rank | Title | Year | Rating | Votes | Duration |
 |------|-------|------|--------|-------|----------|
-"""
+""")
     
-    # Add complete movie list
-    for movie in movies:
-        report_content += f"| {movie['rank']} | {movie['title']} | {movie['year']} | {movie['rating']}/10 | {movie['votes']:,} | {movie['duration']} |\n"
+    # Add complete movie list as one pre-built table body
+    movies = df.to_dict('records')
+    table_body = "\n".join(MOVIE_ROW_FMT.format_map(movie) for movie in movies)
+    parts.append(table_body + "\n")
     
-    report_content += f"""
+    parts.append(f"""
 ## Insights and Observations
 
 ### Quality Consistency
@@ -332,7 +297,7 @@ The following movies from 2020 onwards demonstrate the continued excellence of I
 - This suggests a golden age of Indian cinema in the 21st century
 
 ### Popular Appeal
-- Vote counts range from {min(m['votes'] for m in movies):,} to {max(m['votes'] for m in movies):,}
+- Vote counts range from {vote_counts.min():,} to {vote_counts.max():,}
 - Movies demonstrate both critical acclaim and mass appeal
 
 ### Genre Diversity
@@ -351,7 +316,9 @@ The data demonstrates:
 ---
 
 *Data sourced from IMDb. All ratings and vote counts are current as of the analysis date.*
-"""
+""")
+    
+    report_content = "".join(parts)
     
     # Save the report
     with open('reports/README.md', 'w', encoding='utf-8') as f:
@@ -361,11 +328,11 @@ The data demonstrates:
 
 if __name__ == "__main__":
     # Load data
-    movies, stats = load_data()
+    df, stats = load_data()
     
     # Create reports
-    create_excel_report(movies, stats)
-    create_markdown_report(movies, stats)
+    create_excel_report(df, stats)
+    create_markdown_report(df, stats)
     
     print("\nReport generation complete!")
     print("Files created:")